@@ -1,23 +1,107 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash
+from flask import Flask, render_template, request, redirect, url_for, session, flash, make_response, jsonify
 from database.init_db import init_database, get_db_connection
 from database.db_helper import (
-    save_user_data, save_prediction, get_user_predictions, get_user_data_history
+    save_user_data, save_prediction, get_user_predictions, get_user_data_history,
+    get_latest_prediction,
 )
 from auth.login import authenticate_user
 from auth.register import register_user
 from ml.predict import predict_calories
+from ml.monitor import get_metrics
 from core.exercise import recommend
+from core.profile import Profile, ProfileError
+from server.pools import PoolSaturated, run_db, run_model
+from server.cache import history_cache, page_cache
+from datetime import datetime, timezone
+import hashlib
 import os
 
-app = Flask(__name__)
+# Folder names match the repo layout (Templates/, Static/) on case-sensitive filesystems
+app = Flask(
+    __name__,
+    template_folder="Templates",
+    static_folder="Static",
+    static_url_path="/static",
+)
 # For a real project, load this from environment (e.g. using python-dotenv)
 app.secret_key = "change-this-secret-key"
+# Static assets are cache-busted via ?v=<mtime>, so browsers may keep them for a year
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 365 * 24 * 60 * 60
+# Set per deploy (e.g. the git commit) so cached pages are revalidated after a release
+APP_VERSION = os.environ.get("APP_VERSION", "dev")
+
+
+@app.errorhandler(PoolSaturated)
+def pool_saturated(e):
+    """Shed load when the DB or model pool queue is full."""
+    return "Server is busy, please retry shortly.", 503, {"Retry-After": "1"}
+
+
+@app.template_global()
+def asset_version(filename):
+    """Cache-busting token for a static file (its modification time)."""
+    try:
+        return int(os.path.getmtime(os.path.join(app.static_folder, filename)))
+    except OSError:
+        return 0
+
+
+_render_version = None
+
+
+def render_version():
+    """
+    (token, modified time) covering the deploy version, templates and
+    stylesheet. Part of every ETag and page-cache key, so markup cached by
+    browsers or by page_cache is never reused after any of them changes.
+    Computed once per process (APP_VERSION covers deploys); only rescanned on
+    every call when templates auto-reload, i.e. in debug mode.
+    """
+    global _render_version
+    if _render_version is None or app.debug or app.config.get("TEMPLATES_AUTO_RELOAD"):
+        _render_version = _scan_render_version()
+    return _render_version
+
+
+def _scan_render_version():
+    paths = [os.path.join(app.static_folder, "style.css")]
+    template_dir = os.path.join(app.root_path, app.template_folder)
+    paths += [os.path.join(template_dir, name) for name in os.listdir(template_dir)]
+    mtime = 0
+    for path in paths:
+        try:
+            mtime = max(mtime, int(os.path.getmtime(path)))
+        except OSError:
+            pass
+    return f"{APP_VERSION}.{mtime}", datetime.fromtimestamp(mtime, timezone.utc)
+
+
+def _has_pending_flashes():
+    # Pages carrying flash messages must never be cached or answered with 304.
+    return bool(session.get("_flashes"))
+
 
-# Initialize database on startup
-DB_DIR = os.path.join(os.path.dirname(__file__), "database")
-if not os.path.exists(DB_DIR):
-    os.makedirs(DB_DIR)
-init_database()
+def _conditional(response, etag, last_modified=None):
+    """Attach validators and turn the response into a 304 if the client is current."""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.vary.add("Cookie")
+    return response.make_conditional(request)
+
+
+def render_static_page(template):
+    """Render a session-independent page once and serve it with an ETag."""
+    if _has_pending_flashes():
+        return render_template(template)
+    version, _ = render_version()
+    html = page_cache.get((template, version))
+    if html is None:
+        html = render_template(template)
+        page_cache.set((template, version), html)
+    etag = hashlib.md5(html.encode("utf-8")).hexdigest()
+    return _conditional(make_response(html), etag)
 
 
 @app.route("/")
@@ -25,11 +109,11 @@ def index():
     """Landing page."""
     if session.get("user"):
         return redirect(url_for("dashboard"))
-    return render_template("index.html")
+    return render_static_page("index.html")
 
 
 @app.route("/register", methods=["GET", "POST"])
-def register():
+async def register():
     """User registration page."""
     if session.get("user"):
         return redirect(url_for("dashboard"))
@@ -46,7 +130,7 @@ def register():
             return redirect(url_for("register"))
         
         # Register user
-        success, message, user_id = register_user(username, email, password)
+        success, message, user_id = await run_db(register_user, username, email, password)
         
         if success:
             flash(message, "success")
@@ -55,11 +139,11 @@ def register():
             flash(message, "error")
             return redirect(url_for("register"))
     
-    return render_template("register.html")
+    return render_static_page("register.html")
 
 
 @app.route("/login", methods=["GET", "POST"])
-def login():
+async def login():
     """User login page with password authentication."""
     if session.get("user"):
         return redirect(url_for("dashboard"))
@@ -69,7 +153,7 @@ def login():
         password = request.form.get("password", "")
         
         # Authenticate user
-        success, message, user = authenticate_user(username, password)
+        success, message, user = await run_db(authenticate_user, username, password)
         
         if success:
             session["user"] = user["username"]
@@ -80,36 +164,61 @@ def login():
             flash(message, "error")
             return redirect(url_for("login"))
     
-    return render_template("login.html")
+    return render_static_page("login.html")
 
 
 @app.route("/history")
-def history():
+async def history():
     """View user's calculation history."""
     if not session.get("user"):
         return redirect(url_for("login"))
     
     user_id = session.get("user_id")
-    predictions = get_user_predictions(user_id, limit=20)
-    
-    # Convert Row objects to dictionaries for template
-    history_data = []
-    for pred in predictions:
-        history_data.append({
-            "id": pred["id"],
-            "bmr": pred["bmr"],
-            "tdee": pred["tdee"],
-            "calorie_target": pred["calorie_target"],
-            "ml_prediction": pred["ml_prediction"],
-            "protein": pred["protein"],
-            "carbs": pred["carbs"],
-            "fats": pred["fats"],
-            "exercise_type": pred["exercise_type"],
-            "exercise_duration": pred["exercise_duration"],
-            "created_at": pred["created_at"],
-        })
-    
-    return render_template("history.html", user=session.get("user"), history=history_data)
+    cacheable = not _has_pending_flashes()
+
+    # One indexed lookup decides whether anything changed since the last view
+    latest = await run_db(get_latest_prediction, user_id)
+    latest_id = latest["id"] if latest else 0
+    version, last_modified = render_version()
+    etag = f"history-{user_id}-{latest_id}-{version}"
+    if latest and latest["created_at"]:
+        last_modified = max(last_modified, datetime.strptime(
+            latest["created_at"], "%Y-%m-%d %H:%M:%S"
+        ).replace(tzinfo=timezone.utc))
+
+    if cacheable and request.if_none_match.contains(etag):
+        return _conditional(make_response("", 304), etag, last_modified)
+
+    cache_key = (user_id, latest_id, version)
+    history_html = history_cache.get(cache_key)
+    if history_html is None:
+        predictions = await run_db(get_user_predictions, user_id, limit=20)
+
+        # Convert Row objects to dictionaries for template
+        history_data = []
+        for pred in predictions:
+            history_data.append({
+                "id": pred["id"],
+                "bmr": pred["bmr"],
+                "tdee": pred["tdee"],
+                "calorie_target": pred["calorie_target"],
+                "ml_prediction": pred["ml_prediction"],
+                "protein": pred["protein"],
+                "carbs": pred["carbs"],
+                "fats": pred["fats"],
+                "exercise_type": pred["exercise_type"],
+                "exercise_duration": pred["exercise_duration"],
+                "created_at": pred["created_at"],
+            })
+        history_html = render_template("_history_list.html", history=history_data)
+        history_cache.set(cache_key, history_html)
+
+    response = make_response(
+        render_template("history.html", user=session.get("user"), history_html=history_html)
+    )
+    if not cacheable:
+        return response
+    return _conditional(response, etag, last_modified)
 
 
 @app.route("/logout")
@@ -120,8 +229,34 @@ def logout():
     return redirect(url_for("index"))
 
 
+@app.route("/metrics")
+async def metrics():
+    """Model drift and quality metrics (refreshed by python -m ml.monitor)."""
+    return jsonify(await run_db(get_metrics))
+
+
+def _save_calculation(user_id, profile, result):
+    """Save the inputs and results of one dashboard calculation."""
+    save_user_data(
+        user_id, profile.age, profile.gender_name, profile.height, profile.weight,
+        profile.activity_name, profile.goal_name,
+    )
+    save_prediction(
+        user_id=user_id,
+        bmr=result["bmr"],
+        tdee=result["tdee"],
+        calorie_target=result["calorie_target"],
+        ml_prediction=result["ml_prediction"],
+        protein=result["protein_g"],
+        carbs=result["carbs_g"],
+        fats=result["fats_g"],
+        exercise_type=result["exercise_type"],
+        exercise_duration=result["exercise_duration"],
+    )
+
+
 @app.route("/dashboard", methods=["GET", "POST"])
-def dashboard():
+async def dashboard():
     """Main calorie calculator page."""
     if not session.get("user"):
         return redirect(url_for("login"))
@@ -131,16 +266,14 @@ def dashboard():
 
     if request.method == "POST":
         try:
-            age = int(request.form.get("age", 0))
-            gender = request.form.get("gender")
-            height = float(request.form.get("height", 0.0))  # cm
-            weight = float(request.form.get("weight", 0.0))  # kg
-            activity = request.form.get("activity")
-            goal = request.form.get("goal")
-        except ValueError:
-            flash("Please enter valid numeric values.", "error")
+            profile = Profile.from_form(request.form)
+        except ProfileError as e:
+            flash(str(e), "error")
             return redirect(url_for("dashboard"))
 
+        age, height, weight = profile.age, profile.height, profile.weight  # years, cm, kg
+        gender, activity, goal = profile.gender_name, profile.activity_name, profile.goal_name
+
         # --- BMR: Mifflin-St Jeor ---
         if gender == "male":
             bmr = (10 * weight) + (6.25 * height) - (5 * age) + 5
@@ -154,7 +287,7 @@ def dashboard():
             "moderate": 1.55,
             "active": 1.725,
         }
-        tdee = bmr * activity_map.get(activity, 1.2)
+        tdee = bmr * activity_map[activity]
 
         # --- Goal adjustment ---
         if goal == "loss":
@@ -181,7 +314,7 @@ def dashboard():
         carbs_g = carb_cal / 4
         fats_g = fat_cal / 9
 
-        ml_pred = predict_calories(age, gender, height, weight, activity, goal)
+        ml_pred = await run_model(predict_calories, profile)
         ex = recommend(goal, activity)
         result = {
             "bmr": round(bmr, 2),
@@ -197,21 +330,12 @@ def dashboard():
             "exercise_frequency": ex["exercise_frequency"],
         }
 
-        # Save to database
+        # Save to database (one pool job, so both rows are admitted or rejected together)
         try:
-            save_user_data(user_id, age, gender, height, weight, activity, goal)
-            save_prediction(
-                user_id=user_id,
-                bmr=result["bmr"],
-                tdee=result["tdee"],
-                calorie_target=result["calorie_target"],
-                ml_prediction=ml_pred,
-                protein=result["protein_g"],
-                carbs=result["carbs_g"],
-                fats=result["fats_g"],
-                exercise_type=ex["exercise_type"],
-                exercise_duration=ex["exercise_duration"],
-            )
+            await run_db(_save_calculation, user_id, profile, result)
+            history_cache.invalidate_user(user_id)
+        except PoolSaturated:
+            raise  # answered with 503 + Retry-After
         except Exception as e:
             # Log error but don't break the user experience
             print(f"Error saving to database: {e}")
@@ -220,6 +344,10 @@ def dashboard():
 
 
 if __name__ == "__main__":
-    # Debug mode is helpful during development
+    # Schema migrations run at deploy time (python -m database.migrate);
+    # the development server applies them itself for convenience.
+    init_database()
+    # Debug mode is helpful during development.
+    # For concurrent serving use the ASGI entry point: python asgi.py --workers 4
     app.run(debug=True)
 
@@ -0,0 +1,107 @@
+"""
+ASGI entry point for Calorie Tracker.
+Wraps the Flask app so it can be served by an ASGI server (uvicorn) with
+several worker processes. Within a worker, each request runs on its own
+thread from a pool of WSGI_THREADS threads (a2wsgi), and its async view
+offloads blocking work to the bounded pools in server/pools.py.
+
+"Async" here means threaded WSGI behind an ASGI server: Flask runs each async
+view in a fresh event loop on its request thread, and that thread waits while
+the pool does the work. Per-worker concurrency is therefore --threads; the
+async views add no concurrency of their own. What the pools add is admission
+control: DB and model work beyond their capacity is rejected with a 503.
+
+Run:
+    python asgi.py --workers 4 --threads 64 --port 8000
+or directly:
+    WSGI_THREADS=64 uvicorn asgi:asgi_app --workers 4
+
+With --preload the app and ML model are loaded once in a gunicorn master and
+workers are forked from it, so model pages stay shared copy-on-write.
+"""
+import argparse
+import os
+
+from a2wsgi import WSGIMiddleware
+
+from app import app as flask_app
+from ml.predict import preload_model
+
+# Requests handled concurrently per worker process. Keep it above the DB/model
+# pool capacity so overload is shed with 503s rather than queued silently.
+WSGI_THREADS = int(os.environ.get("WSGI_THREADS", 128))
+
+
+def make_asgi_app(wsgi_app, threads=WSGI_THREADS):
+    """
+    Wrap a WSGI app for ASGI, running each request on a thread pool.
+    (asgiref's WsgiToAsgi is not used: it runs every request on one shared
+    thread, so a worker would serve a single request at a time.)
+    """
+    return WSGIMiddleware(wsgi_app, workers=threads)
+
+
+asgi_app = make_asgi_app(flask_app)
+
+
+def _run_preforked(args):
+    """Serve with gunicorn + uvicorn workers forked from a preloaded master."""
+    from gunicorn.app.base import BaseApplication
+
+    class PreforkApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"{args.host}:{args.port}")
+            self.cfg.set("workers", args.workers)
+            # uvicorn.workers is deprecated; the worker lives in uvicorn-worker now
+            self.cfg.set("worker_class", "uvicorn_worker.UvicornWorker")
+            self.cfg.set("preload_app", True)
+
+        def load(self):
+            return asgi_app
+
+    preload_model()
+    PreforkApplication().run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Calorie Tracker over ASGI.")
+    parser.add_argument("--host", default=os.environ.get("HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)))
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("WEB_CONCURRENCY", 1)),
+        help="Number of server worker processes.",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=WSGI_THREADS,
+        help="Concurrent requests per worker process.",
+    )
+    parser.add_argument(
+        "--preload",
+        action="store_true",
+        default=os.environ.get("PRELOAD_MODEL") == "1",
+        help="Load the model before forking workers (uses gunicorn).",
+    )
+    args = parser.parse_args()
+    # Workers import this module afresh, so pass the thread count through the env
+    os.environ["WSGI_THREADS"] = str(args.threads)
+
+    if args.preload:
+        _run_preforked(args)
+        return
+
+    import uvicorn
+
+    uvicorn.run(
+        "asgi:asgi_app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
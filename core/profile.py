@@ -0,0 +1,134 @@
+"""
+User profile model for Calorie Tracker.
+A Profile is the single parsed, validated form of the calculator inputs.
+Categoricals are stored as small-int enums; numeric fields are range-checked.
+The dashboard form, batch prediction and the ML model all consume Profiles,
+and bulk paths pack them into a NumPy structured array (PROFILE_DTYPE).
+"""
+from enum import IntEnum
+
+import numpy as np
+
+
+class Gender(IntEnum):
+    FEMALE = 0
+    MALE = 1
+
+
+class Activity(IntEnum):
+    SEDENTARY = 0
+    LIGHT = 1
+    MODERATE = 2
+    ACTIVE = 3
+
+
+class Goal(IntEnum):
+    LOSS = 0
+    MAINTAIN = 1
+    GAIN = 2
+
+
+# Category names in code order, e.g. CATEGORY_NAMES["activity"][2] == "moderate"
+CATEGORY_NAMES = {
+    "gender": [g.name.lower() for g in Gender],
+    "activity": [a.name.lower() for a in Activity],
+    "goal": [g.name.lower() for g in Goal],
+}
+
+# Accepted (inclusive) ranges for numeric inputs
+RANGES = {
+    "age": (15, 100),       # years
+    "height": (100.0, 250.0),  # cm
+    "weight": (30.0, 300.0),   # kg
+}
+
+# height/weight stay float64: the model scales them before its float32 split
+# comparisons, so rounding the raw inputs to float32 would change predictions
+PROFILE_DTYPE = np.dtype([
+    ("age", np.uint8),
+    ("gender", np.uint8),
+    ("height", np.float64),
+    ("weight", np.float64),
+    ("activity", np.uint8),
+    ("goal", np.uint8),
+])
+
+
+class ProfileError(ValueError):
+    """Raised when profile input is missing, malformed or out of range."""
+
+
+def _parse_enum(enum_cls, value, field):
+    if isinstance(value, enum_cls):
+        return value
+    try:
+        return enum_cls[str(value).strip().upper()]
+    except KeyError:
+        choices = ", ".join(CATEGORY_NAMES[field])
+        raise ProfileError(f"Invalid {field}: choose one of {choices}.") from None
+
+
+def _parse_number(value, field, cast):
+    try:
+        number = cast(value)
+    except (TypeError, ValueError):
+        raise ProfileError(f"Please enter a valid number for {field}.") from None
+    low, high = RANGES[field]
+    if not low <= number <= high:
+        raise ProfileError(f"{field.capitalize()} must be between {low:g} and {high:g}.")
+    return number
+
+
+class Profile:
+    """Validated calculator inputs with enum-coded categoricals."""
+
+    __slots__ = ("age", "gender", "height", "weight", "activity", "goal")
+
+    def __init__(self, age, gender, height, weight, activity, goal):
+        self.age = _parse_number(age, "age", int)
+        self.gender = _parse_enum(Gender, gender, "gender")
+        self.height = _parse_number(height, "height", float)
+        self.weight = _parse_number(weight, "weight", float)
+        self.activity = _parse_enum(Activity, activity, "activity")
+        self.goal = _parse_enum(Goal, goal, "goal")
+
+    @classmethod
+    def from_form(cls, form):
+        """Build a Profile from a request form (or any mapping); raises ProfileError."""
+        return cls(
+            form.get("age"),
+            form.get("gender"),
+            form.get("height"),
+            form.get("weight"),
+            form.get("activity"),
+            form.get("goal"),
+        )
+
+    # String names, as stored in the database and used by core.exercise
+    @property
+    def gender_name(self):
+        return self.gender.name.lower()
+
+    @property
+    def activity_name(self):
+        return self.activity.name.lower()
+
+    @property
+    def goal_name(self):
+        return self.goal.name.lower()
+
+    def as_record(self):
+        """Tuple matching PROFILE_DTYPE field order."""
+        return (self.age, int(self.gender), self.height, self.weight,
+                int(self.activity), int(self.goal))
+
+    def __repr__(self):
+        return (
+            f"Profile(age={self.age}, gender={self.gender_name}, height={self.height}, "
+            f"weight={self.weight}, activity={self.activity_name}, goal={self.goal_name})"
+        )
+
+
+def pack_profiles(profiles):
+    """Pack Profiles into a PROFILE_DTYPE structured array."""
+    return np.array([p.as_record() for p in profiles], dtype=PROFILE_DTYPE)
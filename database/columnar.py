@@ -0,0 +1,244 @@
+"""
+Columnar analytics store for Calorie Tracker.
+Periodically exports `predictions` and `user_data` from the primary database
+into append-only Parquet files, partitioned by day:
+
+    database/analytics/<table>/date=YYYY-MM-DD/part-<first id>-<last id>.parquet
+
+Aggregate reports are computed from these files with pandas/pyarrow, so they
+never scan the OLTP database. Exports are incremental: the last exported id of
+each table is kept in _state.json and only newer rows are read.
+
+Frequent exports leave many small files in the current day's partition. Once a
+day is over (UTC, like SQLite's CURRENT_TIMESTAMP) compact() rewrites its
+partition into a single file, so reports over past days open one file per day.
+The export command compacts after every run.
+
+    python -m database.columnar export             # one incremental export
+    python -m database.columnar export --every 300  # keep exporting every 5 min
+    python -m database.columnar compact             # compact closed days only
+    python -m database.columnar report              # daily prediction summary
+"""
+import argparse
+import glob
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from database.repository import get_repository
+
+STORE_DIR = os.path.join(os.path.dirname(__file__), "analytics")
+STATE_FILE = "_state.json"
+TABLES = ("user_data", "predictions")
+# Partition for rows without a created_at; kept out of date-range reads
+UNKNOWN_DATE = "unknown"
+
+# Every file of a table is written with the same schema, so an all-NULL column
+# in one batch (e.g. no ml_prediction when the model is missing) is still typed
+SCHEMAS = {
+    "user_data": pa.schema([
+        ("id", pa.int64()),
+        ("user_id", pa.int64()),
+        ("age", pa.int64()),
+        ("gender", pa.string()),
+        ("height", pa.float64()),
+        ("weight", pa.float64()),
+        ("activity_level", pa.string()),
+        ("goal", pa.string()),
+        ("created_at", pa.string()),
+    ]),
+    "predictions": pa.schema([
+        ("id", pa.int64()),
+        ("user_id", pa.int64()),
+        ("bmr", pa.float64()),
+        ("tdee", pa.float64()),
+        ("calorie_target", pa.float64()),
+        ("ml_prediction", pa.float64()),
+        ("protein", pa.float64()),
+        ("carbs", pa.float64()),
+        ("fats", pa.float64()),
+        ("exercise_type", pa.string()),
+        ("exercise_duration", pa.int64()),
+        ("created_at", pa.string()),
+    ]),
+}
+DEFAULT_BATCH_SIZE = 50000
+
+
+class ColumnarStore:
+    """Append-only, day-partitioned Parquet copy of the exportable tables."""
+
+    def __init__(self, root=STORE_DIR, source=None):
+        self.root = root
+        self.source = source
+
+    def _state_path(self):
+        return os.path.join(self.root, STATE_FILE)
+
+    def load_state(self):
+        """Return {table: last exported id}."""
+        try:
+            with open(self._state_path()) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _save_state(self, state):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self._state_path() + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, self._state_path())
+
+    def export(self, batch_size=DEFAULT_BATCH_SIZE):
+        """Append rows added since the last export. Returns {table: rows written}."""
+        source = self.source or get_repository()
+        state = self.load_state()
+        written = {}
+        for table in TABLES:
+            written[table] = 0
+            for rows in source.iter_rows(table, state.get(table, 0), batch_size):
+                df = pd.DataFrame(rows)
+                dates = df["created_at"].fillna(UNKNOWN_DATE).astype(str).str[:10]
+                for date, part in df.groupby(dates):
+                    part_dir = os.path.join(self.root, table, f"date={date}")
+                    os.makedirs(part_dir, exist_ok=True)
+                    path = os.path.join(
+                        part_dir, f"part-{part['id'].min():012d}-{part['id'].max():012d}.parquet"
+                    )
+                    pq.write_table(
+                        pa.Table.from_pandas(part, schema=SCHEMAS[table], preserve_index=False),
+                        path,
+                    )
+                # Advance the watermark only after the batch's files exist
+                state[table] = int(df["id"].max())
+                self._save_state(state)
+                written[table] += len(df)
+        return written
+
+    def compact(self, today=None):
+        """
+        Rewrite every closed day partition holding more than one file into a
+        single file. Returns {table: partitions compacted}.
+        The merged file is written under a dot-prefixed name (ignored by
+        readers) and renamed into place before the old files are removed;
+        a reader that catches both sees duplicate ids, which read() drops.
+        """
+        today = today or datetime.now(timezone.utc).date().isoformat()
+        compacted = {}
+        for table in TABLES:
+            compacted[table] = 0
+            for part_dir in sorted(glob.glob(os.path.join(self.root, table, "date=*"))):
+                date = os.path.basename(part_dir)[len("date="):]
+                if date == UNKNOWN_DATE or date >= today:
+                    continue
+                files = sorted(glob.glob(os.path.join(part_dir, "part-*.parquet")))
+                if len(files) < 2:
+                    continue
+                merged = pa.concat_tables(
+                    [pq.read_table(f, schema=SCHEMAS[table]) for f in files]
+                ).to_pandas()
+                merged = merged.drop_duplicates("id").sort_values("id")
+                target = os.path.join(
+                    part_dir,
+                    f"part-{merged['id'].min():012d}-{merged['id'].max():012d}.parquet",
+                )
+                tmp = os.path.join(part_dir, ".compact.parquet")
+                pq.write_table(
+                    pa.Table.from_pandas(merged, schema=SCHEMAS[table], preserve_index=False),
+                    tmp,
+                )
+                os.replace(tmp, target)
+                for f in files:
+                    if f != target:
+                        os.remove(f)
+                compacted[table] += 1
+        return compacted
+
+    def read(self, table, columns=None, start=None, end=None):
+        """
+        Load a table (optionally only some columns) from the column store.
+        start/end are inclusive 'YYYY-MM-DD' bounds applied as partition filters,
+        so files outside the range are never opened. Rows without a date are
+        excluded whenever a bound is given.
+        """
+        path = os.path.join(self.root, table)
+        if not os.path.isdir(path):
+            return pd.DataFrame(columns=columns)
+        filters = []
+        if start:
+            filters.append(("date", ">=", start))
+        if end:
+            filters.append(("date", "<=", end))
+        if filters:
+            filters.append(("date", "!=", UNKNOWN_DATE))
+        if columns is not None and "id" not in columns:
+            columns = ["id", *columns]
+        df = pd.read_parquet(
+            path,
+            engine="pyarrow",
+            columns=columns,
+            filters=filters or None,
+            schema=SCHEMAS[table].append(pa.field("date", pa.string())),
+        )
+        # An interrupted export may have rewritten a batch; ids are unique upstream
+        return df.drop_duplicates("id")
+
+    def prediction_report(self, start=None, end=None):
+        """Daily prediction volume, averages and model-vs-formula error."""
+        df = self.read(
+            "predictions",
+            columns=["user_id", "calorie_target", "ml_prediction", "created_at"],
+            start=start,
+            end=end,
+        )
+        if df.empty:
+            return pd.DataFrame(
+                columns=["predictions", "users", "avg_calorie_target", "avg_ml_prediction", "ml_mae"]
+            )
+        df["day"] = df["created_at"].astype(str).str[:10]
+        df["ml_abs_error"] = (df["ml_prediction"] - df["calorie_target"]).abs()
+        report = df.groupby("day").agg(
+            predictions=("id", "count"),
+            users=("user_id", "nunique"),
+            avg_calorie_target=("calorie_target", "mean"),
+            avg_ml_prediction=("ml_prediction", "mean"),
+            ml_mae=("ml_abs_error", "mean"),
+        )
+        return report.round(2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calorie Tracker columnar analytics store.")
+    parser.add_argument("command", choices=["export", "compact", "report"])
+    parser.add_argument("--root", default=STORE_DIR, help="Column store directory.")
+    parser.add_argument("--every", type=int, default=0,
+                        help="Repeat the export every N seconds (0 = once).")
+    parser.add_argument("--start", default=None, help="Report start date (YYYY-MM-DD).")
+    parser.add_argument("--end", default=None, help="Report end date (YYYY-MM-DD).")
+    args = parser.parse_args()
+
+    store = ColumnarStore(args.root)
+    if args.command == "report":
+        print(store.prediction_report(args.start, args.end).to_string())
+        return
+    if args.command == "compact":
+        print(store.compact())
+        return
+
+    while True:
+        written = store.export()
+        print(", ".join(f"{table}: {n} rows" for table, n in written.items()))
+        store.compact()
+        if not args.every:
+            break
+        time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    main()
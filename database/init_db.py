@@ -1,67 +1,21 @@
 """
 Database initialization script for Calorie Tracker.
-Creates SQLite database with all required tables.
+Creates the SQLite database by applying all schema migrations
+(see database/migrate.py and database/migrations/).
 """
 import sqlite3
 import os
+import sys
 
 # Database file path
 DB_PATH = os.path.join(os.path.dirname(__file__), "calorie_tracker.db")
 
 
 def init_database():
-    """Initialize the database with all required tables."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    # Create users table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    # Create user_data table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS user_data (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            age INTEGER,
-            gender TEXT,
-            height REAL,
-            weight REAL,
-            activity_level TEXT,
-            goal TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-        )
-    """)
-
-    # Create predictions table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS predictions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            bmr REAL,
-            tdee REAL,
-            calorie_target REAL,
-            ml_prediction REAL,
-            protein REAL,
-            carbs REAL,
-            fats REAL,
-            exercise_type TEXT,
-            exercise_duration INTEGER,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-        )
-    """)
+    """Initialize the database by applying any pending migrations."""
+    from database.migrate import upgrade
 
-    conn.commit()
-    conn.close()
+    upgrade(DB_PATH)
     print(f"Database initialized successfully at: {DB_PATH}")
 
 
@@ -73,4 +27,6 @@ def get_db_connection():
 
 
 if __name__ == "__main__":
+    # Allow `python database/init_db.py` from the project root
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     init_database()
@@ -0,0 +1,202 @@
+"""
+Schema migrations for Calorie Tracker.
+Applies the ordered scripts in database/migrations/ (NNNN_description.py, each
+defining upgrade(conn)) and records them in a schema_version table.
+Run once at deploy time:
+
+    python -m database.migrate            # apply pending migrations
+    python -m database.migrate status     # show applied / pending
+    python -m database.migrate upgrade --target 2
+
+A migration runs inside a single transaction unless it sets
+TRANSACTIONAL = False; those manage their own commits, e.g. via
+backfill_in_batches(), so large tables are never locked for long.
+"""
+import argparse
+import importlib
+import os
+import pkgutil
+import re
+import sqlite3
+import time
+
+from database.init_db import DB_PATH
+
+MIGRATIONS_PACKAGE = "database.migrations"
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "migrations")
+MIGRATION_NAME = re.compile(r"^(\d{4})_(\w+)$")
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+def _connect(db_path):
+    # Autocommit mode: the runner and helpers issue BEGIN/COMMIT explicitly.
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    # WAL lets the app keep reading while a migration writes.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA busy_timeout = 5000")
+    return conn
+
+
+def _ensure_version_table(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def discover_migrations():
+    """Return [(version, name, module_name)] sorted by version."""
+    found = []
+    for info in pkgutil.iter_modules([MIGRATIONS_DIR]):
+        match = MIGRATION_NAME.match(info.name)
+        if match:
+            found.append((int(match.group(1)), match.group(2), info.name))
+    found.sort()
+    versions = [v for v, _, _ in found]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions in {MIGRATIONS_DIR}")
+    return found
+
+
+def current_version(conn):
+    """Highest applied migration version (0 for a fresh database)."""
+    _ensure_version_table(conn)
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def applied_versions(conn):
+    _ensure_version_table(conn)
+    return {row["version"] for row in conn.execute("SELECT version FROM schema_version")}
+
+
+def upgrade(db_path=DB_PATH, target=None, verbose=True):
+    """Apply pending migrations up to target (default: latest). Returns versions applied."""
+    conn = _connect(db_path)
+    try:
+        done = applied_versions(conn)
+        applied = []
+        for version, name, module_name in discover_migrations():
+            if target is not None and version > target:
+                break
+            if version in done:
+                continue
+            module = importlib.import_module(f"{MIGRATIONS_PACKAGE}.{module_name}")
+            transactional = getattr(module, "TRANSACTIONAL", True)
+            start = time.monotonic()
+            if transactional:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    module.upgrade(conn)
+                    conn.execute(
+                        "INSERT INTO schema_version (version, name) VALUES (?, ?)",
+                        (version, name),
+                    )
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            else:
+                # Must be idempotent: it may be re-run after a partial failure.
+                module.upgrade(conn)
+                conn.execute(
+                    "INSERT INTO schema_version (version, name) VALUES (?, ?)",
+                    (version, name),
+                )
+            applied.append(version)
+            if verbose:
+                print(f"Applied {version:04d}_{name} ({time.monotonic() - start:.2f}s)")
+        return applied
+    finally:
+        conn.close()
+
+
+def status(db_path=DB_PATH):
+    """Return [(version, name, applied: bool)] for every known migration."""
+    conn = _connect(db_path)
+    try:
+        done = applied_versions(conn)
+    finally:
+        conn.close()
+    return [(v, name, v in done) for v, name, _ in discover_migrations()]
+
+
+def create_index(conn, name, table, columns, unique=False):
+    """
+    Create an index in its own short transaction.
+    SQLite builds an index in one pass; keeping it out of any larger
+    migration transaction means the write lock is held only for the build.
+    """
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(
+            f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def backfill_in_batches(conn, table, set_clause, where_clause="1=1",
+                        set_params=(), where_params=(),
+                        batch_size=DEFAULT_BATCH_SIZE, pause=0.0):
+    """
+    UPDATE table SET <set_clause> WHERE <where_clause>, walking the rowid
+    range in chunks of batch_size and committing after each chunk so other
+    writers can get in between. Placeholders in set_clause bind set_params,
+    placeholders in where_clause bind where_params.
+    Returns the number of rows updated.
+    """
+    row = conn.execute(f"SELECT MIN(rowid), MAX(rowid) FROM {table}").fetchone()
+    low, high = row[0], row[1]
+    if low is None:
+        return 0
+    total = 0
+    while low <= high:
+        upper = low + batch_size - 1
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.execute(
+                f"UPDATE {table} SET {set_clause} "
+                f"WHERE rowid BETWEEN ? AND ? AND ({where_clause})",
+                (*set_params, low, upper, *where_params),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        total += cursor.rowcount
+        low = upper + 1
+        if pause:
+            time.sleep(pause)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply Calorie Tracker schema migrations.")
+    parser.add_argument("command", nargs="?", default="upgrade", choices=["upgrade", "status"])
+    parser.add_argument("--target", type=int, default=None, help="Stop at this version.")
+    parser.add_argument("--db", default=DB_PATH, help="Path to the SQLite database.")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        for version, name, done in status(args.db):
+            print(f"[{'x' if done else ' '}] {version:04d}_{name}")
+        return
+
+    applied = upgrade(args.db, target=args.target)
+    if not applied:
+        print("Database schema is up to date.")
+    else:
+        print(f"Database migrated to version {applied[-1]} at: {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Initial schema: users, user_data, predictions.
+Uses IF NOT EXISTS so databases created before migrations existed adopt it as-is.
+"""
+
+
+def upgrade(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS user_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            age INTEGER,
+            gender TEXT,
+            height REAL,
+            weight REAL,
+            activity_level TEXT,
+            goal TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS predictions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            bmr REAL,
+            tdee REAL,
+            calorie_target REAL,
+            ml_prediction REAL,
+            protein REAL,
+            carbs REAL,
+            fats REAL,
+            exercise_type TEXT,
+            exercise_duration INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """)
@@ -0,0 +1,12 @@
+"""
+Index predictions by (user_id, id) for history and latest-prediction lookups.
+Built outside a wrapping transaction so it holds the write lock only for the
+CREATE INDEX itself.
+"""
+from database.migrate import create_index
+
+TRANSACTIONAL = False
+
+
+def upgrade(conn):
+    create_index(conn, "idx_predictions_user_id", "predictions", ["user_id", "id"])
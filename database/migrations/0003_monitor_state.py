@@ -0,0 +1,14 @@
+"""
+Key/value table for incremental jobs (e.g. the drift monitor) to persist
+their watermarks and running statistics between runs.
+"""
+
+
+def upgrade(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS monitor_state (
+            name TEXT PRIMARY KEY,
+            state TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
@@ -0,0 +1 @@
+# Ordered schema migrations (NNNN_description.py), applied by database/migrate.py
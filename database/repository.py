@@ -0,0 +1,221 @@
+"""
+Storage backends for Calorie Tracker.
+Repository defines the operations the app needs; SQLiteRepository is the
+default (OLTP) implementation. database/db_helper.py delegates to whichever
+repository is active, so a different backend can be plugged in with
+set_repository() without touching callers.
+"""
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+from database.init_db import get_db_connection
+
+
+class Repository(ABC):
+    """Interface for user, input and prediction storage."""
+
+    @abstractmethod
+    def get_user_by_username(self, username):
+        ...
+
+    @abstractmethod
+    def get_user_by_email(self, email):
+        ...
+
+    @abstractmethod
+    def create_user(self, username, email, password_hash):
+        ...
+
+    @abstractmethod
+    def save_user_data(self, user_id, age, gender, height, weight, activity_level, goal):
+        ...
+
+    @abstractmethod
+    def save_prediction(self, user_id, bmr, tdee, calorie_target, ml_prediction,
+                        protein, carbs, fats, exercise_type=None, exercise_duration=None):
+        ...
+
+    @abstractmethod
+    def get_user_predictions(self, user_id, limit=10):
+        ...
+
+    @abstractmethod
+    def get_latest_prediction(self, user_id):
+        ...
+
+    @abstractmethod
+    def get_user_data_history(self, user_id, limit=10):
+        ...
+
+    @abstractmethod
+    def iter_rows(self, table, after_id=0, batch_size=10000):
+        """Yield lists of rows (dicts) from table with id > after_id, in id order."""
+        ...
+
+    @abstractmethod
+    def load_monitor_state(self, name):
+        """Return the saved state dict for an incremental job, or None."""
+        ...
+
+    @abstractmethod
+    def save_monitor_state(self, name, state):
+        """Persist an incremental job's state dict."""
+        ...
+
+
+class SQLiteRepository(Repository):
+    """Row-at-a-time SQLite storage (the app's primary database)."""
+
+    # Tables that may be bulk-read by iter_rows (used by analytics exports)
+    EXPORTABLE_TABLES = ("user_data", "predictions")
+
+    def get_user_by_username(self, username):
+        conn = get_db_connection()
+        user = conn.execute(
+            "SELECT * FROM users WHERE username = ?", (username,)
+        ).fetchone()
+        conn.close()
+        return user
+
+    def get_user_by_email(self, email):
+        conn = get_db_connection()
+        user = conn.execute(
+            "SELECT * FROM users WHERE email = ?", (email,)
+        ).fetchone()
+        conn.close()
+        return user
+
+    def create_user(self, username, email, password_hash):
+        conn = get_db_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+                (username, email, password_hash)
+            )
+            conn.commit()
+            user_id = cursor.lastrowid
+            conn.close()
+            return user_id
+        except sqlite3.IntegrityError:
+            conn.close()
+            return None
+
+    def save_user_data(self, user_id, age, gender, height, weight, activity_level, goal):
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            """INSERT INTO user_data 
+               (user_id, age, gender, height, weight, activity_level, goal) 
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (user_id, age, gender, height, weight, activity_level, goal)
+        )
+        conn.commit()
+        data_id = cursor.lastrowid
+        conn.close()
+        return data_id
+
+    def save_prediction(self, user_id, bmr, tdee, calorie_target, ml_prediction,
+                        protein, carbs, fats, exercise_type=None, exercise_duration=None):
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            """INSERT INTO predictions 
+               (user_id, bmr, tdee, calorie_target, ml_prediction, 
+                protein, carbs, fats, exercise_type, exercise_duration) 
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (user_id, bmr, tdee, calorie_target, ml_prediction,
+             protein, carbs, fats, exercise_type, exercise_duration)
+        )
+        conn.commit()
+        pred_id = cursor.lastrowid
+        conn.close()
+        return pred_id
+
+    def get_user_predictions(self, user_id, limit=10):
+        conn = get_db_connection()
+        predictions = conn.execute(
+            """SELECT * FROM predictions 
+               WHERE user_id = ? 
+               ORDER BY created_at DESC 
+               LIMIT ?""",
+            (user_id, limit)
+        ).fetchall()
+        conn.close()
+        return predictions
+
+    def get_latest_prediction(self, user_id):
+        conn = get_db_connection()
+        latest = conn.execute(
+            """SELECT id, created_at FROM predictions 
+               WHERE user_id = ? 
+               ORDER BY id DESC 
+               LIMIT 1""",
+            (user_id,)
+        ).fetchone()
+        conn.close()
+        return latest
+
+    def get_user_data_history(self, user_id, limit=10):
+        conn = get_db_connection()
+        history = conn.execute(
+            """SELECT * FROM user_data 
+               WHERE user_id = ? 
+               ORDER BY created_at DESC 
+               LIMIT ?""",
+            (user_id, limit)
+        ).fetchall()
+        conn.close()
+        return history
+
+    def iter_rows(self, table, after_id=0, batch_size=10000):
+        if table not in self.EXPORTABLE_TABLES:
+            raise ValueError(f"Table not exportable: {table}")
+        conn = get_db_connection()
+        try:
+            # Keyset pagination on the primary key: each batch is an index range scan
+            while True:
+                rows = conn.execute(
+                    f"SELECT * FROM {table} WHERE id > ? ORDER BY id LIMIT ?",
+                    (after_id, batch_size)
+                ).fetchall()
+                if not rows:
+                    break
+                yield [dict(row) for row in rows]
+                after_id = rows[-1]["id"]
+        finally:
+            conn.close()
+
+    def load_monitor_state(self, name):
+        conn = get_db_connection()
+        row = conn.execute(
+            "SELECT state FROM monitor_state WHERE name = ?", (name,)
+        ).fetchone()
+        conn.close()
+        return json.loads(row["state"]) if row else None
+
+    def save_monitor_state(self, name, state):
+        conn = get_db_connection()
+        conn.execute(
+            """INSERT INTO monitor_state (name, state, updated_at) 
+               VALUES (?, ?, CURRENT_TIMESTAMP) 
+               ON CONFLICT(name) DO UPDATE SET 
+               state = excluded.state, updated_at = excluded.updated_at""",
+            (name, json.dumps(state))
+        )
+        conn.commit()
+        conn.close()
+
+
+_repository = SQLiteRepository()
+
+
+def get_repository():
+    """Return the active storage backend."""
+    return _repository
+
+
+def set_repository(repository):
+    """Swap the active storage backend (e.g. for another database or tests)."""
+    global _repository
+    _repository = repository
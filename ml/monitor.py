@@ -0,0 +1,298 @@
+"""
+Prediction drift and model-quality monitoring for Calorie Tracker.
+Scans new `predictions` and `user_data` rows incrementally (from a saved id
+watermark) and keeps constant-size running statistics:
+
+- error between ml_prediction and the formula calorie_target (Welford mean/var
+  plus an exponentially weighted "recent" mean),
+- fixed-bin histograms of age, weight and activity, both cumulative and
+  exponentially decayed, compared to the training data with the population
+  stability index (PSI).
+
+State is stored in the monitor_state table, so each run only reads new rows.
+
+Known lag: predictions do not record which model produced them. After a
+retrain the error statistics are reset, but rows the old model wrote that the
+monitor had not scanned yet are still counted against the new model. Run the
+monitor just before deploying a retrained model to keep that window small.
+Drift flags are exposed on the app's /metrics endpoint; `check` exits non-zero
+when retraining is recommended, so it can gate a retrain job.
+
+    python -m ml.monitor run               # process new rows, print metrics
+    python -m ml.monitor run --every 300   # keep monitoring every 5 min
+    python -m ml.monitor check             # exit 1 if drift is flagged
+"""
+import argparse
+import bisect
+import csv
+import json
+import math
+import os
+import sys
+import time
+
+from core.profile import CATEGORY_NAMES
+from database.repository import get_repository
+from ml.shared_model import MODEL_PATH, source_fingerprint
+
+ML_DIR = os.path.dirname(__file__)
+DATA_PATH = os.path.join(ML_DIR, "data", "calorie_data.csv")
+STATE_NAME = "drift_monitor"
+
+# Weight of each new row in the "recent" statistics (~1/ALPHA rows of memory)
+ALPHA = 0.01
+MIN_SAMPLES = 200
+PSI_THRESHOLD = 0.2
+REL_ERROR_THRESHOLD = 0.10
+
+AGE_EDGES = [20, 25, 30, 35, 40, 45, 50, 55, 60, 65, 70, 80]
+WEIGHT_EDGES = [45, 55, 65, 75, 85, 95, 110, 130, 160]
+
+
+class RunningStats:
+    """Count, mean, variance (Welford), min/max and an EWMA of a stream."""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0, minimum=None, maximum=None, ewma=None):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.minimum = minimum
+        self.maximum = maximum
+        self.ewma = ewma
+
+    def update(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        self.minimum = x if self.minimum is None else min(self.minimum, x)
+        self.maximum = x if self.maximum is None else max(self.maximum, x)
+        self.ewma = x if self.ewma is None else (1 - ALPHA) * self.ewma + ALPHA * x
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def to_dict(self):
+        return {
+            "count": self.count, "mean": self.mean, "m2": self.m2,
+            "minimum": self.minimum, "maximum": self.maximum, "ewma": self.ewma,
+        }
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 4),
+            "std": round(self.std, 4),
+            "min": self.minimum,
+            "max": self.maximum,
+            "recent_mean": None if self.ewma is None else round(self.ewma, 4),
+        }
+
+
+class Histogram:
+    """
+    Fixed-bin sketch of a numeric (edges) or categorical (labels) stream.
+    Numeric bins include an underflow and overflow bin; categorical ones an
+    "other" bin. `recent` is an exponentially decayed copy of `counts`.
+    """
+
+    def __init__(self, edges=None, labels=None, counts=None, recent=None):
+        self.edges = edges
+        self.labels = labels
+        n_bins = len(edges) + 1 if edges is not None else len(labels) + 1
+        self.counts = counts or [0] * n_bins
+        self.recent = recent or [0.0] * n_bins
+
+    def bin_index(self, value):
+        if self.edges is not None:
+            return bisect.bisect_right(self.edges, float(value))
+        try:
+            return self.labels.index(value)
+        except ValueError:
+            return len(self.labels)
+
+    def update(self, value):
+        i = self.bin_index(value)
+        self.counts[i] += 1
+        self.recent = [r * (1 - ALPHA) for r in self.recent]
+        self.recent[i] += ALPHA
+
+    def psi(self, reference):
+        """Population stability index of the recent distribution vs reference counts."""
+        eps = 1e-4
+        ref_total = sum(reference) or 1
+        cur_total = sum(self.recent) or 1
+        score = 0.0
+        for r, c in zip(reference, self.recent):
+            p = max(r / ref_total, eps)
+            q = max(c / cur_total, eps)
+            score += (q - p) * math.log(q / p)
+        return score
+
+    def to_dict(self):
+        return {"counts": self.counts, "recent": self.recent}
+
+
+def _new_histograms():
+    return {
+        "age": Histogram(edges=AGE_EDGES),
+        "weight": Histogram(edges=WEIGHT_EDGES),
+        "activity": Histogram(labels=CATEGORY_NAMES["activity"]),
+    }
+
+
+def build_reference(path=DATA_PATH):
+    """Histogram counts of the training data, streamed row by row."""
+    hists = _new_histograms()
+    if not os.path.isfile(path):
+        return None
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            for name, hist in hists.items():
+                i = hist.bin_index(row[name])
+                hist.counts[i] += 1
+    return {name: hist.counts for name, hist in hists.items()}
+
+
+# user_data stores activity as activity_level
+INPUT_COLUMNS = {"age": "age", "weight": "weight", "activity": "activity_level"}
+
+
+class DriftMonitor:
+    """Incremental drift/quality monitor with O(1) state."""
+
+    def __init__(self, state=None):
+        state = state or {}
+        self.watermarks = state.get("watermarks", {"predictions": 0, "user_data": 0})
+        self.error = RunningStats(**state.get("error", {}))
+        self.rel_error = RunningStats(**state.get("rel_error", {}))
+        self.reference = state.get("reference")
+        # Fingerprints of the training data / model the reference and error stats belong to
+        self.sources = state.get("sources", {})
+        self.histograms = _new_histograms()
+        for name, saved in state.get("histograms", {}).items():
+            self.histograms[name].counts = saved["counts"]
+            self.histograms[name].recent = saved["recent"]
+
+    def to_state(self):
+        return {
+            "watermarks": self.watermarks,
+            "error": self.error.to_dict(),
+            "rel_error": self.rel_error.to_dict(),
+            "reference": self.reference,
+            "sources": self.sources,
+            "histograms": {name: h.to_dict() for name, h in self.histograms.items()},
+        }
+
+    def process(self, source, batch_size=10000):
+        """Consume rows newer than the watermarks. Returns rows processed per table."""
+        seen = {"predictions": 0, "user_data": 0}
+        for rows in source.iter_rows("predictions", self.watermarks["predictions"], batch_size):
+            for row in rows:
+                ml, target = row["ml_prediction"], row["calorie_target"]
+                if ml is not None and target:
+                    self.error.update(ml - target)
+                    self.rel_error.update(abs(ml - target) / abs(target))
+            self.watermarks["predictions"] = rows[-1]["id"]
+            seen["predictions"] += len(rows)
+        for rows in source.iter_rows("user_data", self.watermarks["user_data"], batch_size):
+            for row in rows:
+                for name, column in INPUT_COLUMNS.items():
+                    if row[column] is not None:
+                        self.histograms[name].update(row[column])
+            self.watermarks["user_data"] = rows[-1]["id"]
+            seen["user_data"] += len(rows)
+        return seen
+
+    def report(self):
+        """Metrics and drift flags as a JSON-serialisable dict."""
+        psi = {}
+        drift = {}
+        for name, hist in self.histograms.items():
+            enough = sum(hist.counts) >= MIN_SAMPLES
+            if self.reference and enough:
+                psi[name] = round(hist.psi(self.reference[name]), 4)
+                drift[name] = psi[name] > PSI_THRESHOLD
+            else:
+                psi[name] = None
+                drift[name] = False
+        recent_rel = self.rel_error.ewma
+        drift["model_error"] = (
+            self.rel_error.count >= MIN_SAMPLES
+            and recent_rel is not None
+            and recent_rel > REL_ERROR_THRESHOLD
+        )
+        return {
+            "watermarks": self.watermarks,
+            "error": self.error.summary(),
+            "relative_error": self.rel_error.summary(),
+            "inputs": {
+                name: {
+                    "bins": hist.labels + ["other"] if hist.labels else hist.edges,
+                    "counts": hist.counts,
+                }
+                for name, hist in self.histograms.items()
+            },
+            "psi": psi,
+            "drift": drift,
+            "retrain_recommended": any(drift.values()),
+        }
+
+
+def refresh_reference(monitor, data_path=None, model_path=None):
+    """
+    Rebuild the reference histograms when the training data changes, and
+    reset the error statistics when the model changes, so drift is always
+    measured against what the current model was trained on.
+    The predictions watermark is not moved: unscanned rows written by the
+    previous model are attributed to the new one (see module docstring).
+    """
+    data_path = data_path or DATA_PATH
+    model_path = model_path or MODEL_PATH
+    data = source_fingerprint(data_path)
+    model = source_fingerprint(model_path)
+    if monitor.reference is None or monitor.sources.get("data") != data:
+        monitor.reference = build_reference(data_path)
+    if monitor.sources and monitor.sources.get("model") != model:
+        monitor.error = RunningStats()
+        monitor.rel_error = RunningStats()
+    monitor.sources = {"data": data, "model": model}
+
+
+def run_once(source=None):
+    """Process new rows, persist state, and return the report."""
+    source = source or get_repository()
+    monitor = DriftMonitor(source.load_monitor_state(STATE_NAME))
+    refresh_reference(monitor)
+    monitor.process(source)
+    source.save_monitor_state(STATE_NAME, monitor.to_state())
+    return monitor.report()
+
+
+def get_metrics(source=None):
+    """Report from the last saved state (no scanning); used by /metrics."""
+    source = source or get_repository()
+    return DriftMonitor(source.load_monitor_state(STATE_NAME)).report()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calorie Tracker drift monitor.")
+    parser.add_argument("command", nargs="?", default="run", choices=["run", "check"])
+    parser.add_argument("--every", type=int, default=0,
+                        help="Repeat every N seconds (0 = once).")
+    args = parser.parse_args()
+
+    while True:
+        report = run_once()
+        if args.command == "check":
+            print(json.dumps(report["drift"]))
+            sys.exit(1 if report["retrain_recommended"] else 0)
+        print(json.dumps(report, indent=2))
+        if not args.every:
+            break
+        time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,97 @@
 """
 Prediction wrapper for Calorie Tracker.
-Loads the trained pipeline and predicts daily calorie requirement from raw inputs.
+Loads the trained pipeline and predicts daily calorie requirement from
+validated user profiles (core.profile.Profile).
+The model is loaded once per process; if a shared export exists
+(ml/model_shared, see shared_model.py) it is memory-mapped instead of unpickled
+so all worker processes share the same read-only pages, and profiles are fed to
+it as pre-encoded integer codes rather than strings.
 """
+import logging
 import os
+import numpy as np
 import pandas as pd
 import joblib
 
+from core.profile import CATEGORY_NAMES, PROFILE_DTYPE, pack_profiles
+from ml.shared_model import SHARED_MODEL_DIR, SharedModel, has_shared_model, is_stale
+
 ML_DIR = os.path.dirname(__file__)
 MODEL_PATH = os.path.join(ML_DIR, "model.pkl")
 
 FEATURE_COLS = ["age", "gender", "height", "weight", "activity", "goal"]
 
+logger = logging.getLogger(__name__)
+
+# Loaded once per process: workers must be restarted to pick up a new export
+_model = None
+
+
+def load_model():
+    """
+    Return the cached model, loading it on first use.
+    Prefers the memory-mapped shared export over model.pkl, unless model.pkl
+    has been replaced since the export was built.
+    Returns None if neither exists.
+    """
+    global _model
+    if _model is None:
+        shared = has_shared_model(SHARED_MODEL_DIR)
+        if shared and not is_stale(SHARED_MODEL_DIR, MODEL_PATH):
+            _model = SharedModel.load(SHARED_MODEL_DIR)
+        elif os.path.isfile(MODEL_PATH):
+            if shared:
+                logger.warning(
+                    "Shared model export %s is older than %s; loading a private copy. "
+                    "Re-export with: python ml/shared_model.py",
+                    SHARED_MODEL_DIR, MODEL_PATH,
+                )
+            # Plain load: sklearn copies tree arrays into private memory anyway,
+            # so mmap_mode would not share anything here
+            _model = joblib.load(MODEL_PATH)
+    return _model
+
+
+def preload_model():
+    """Load the model in the parent process so forked workers inherit it copy-on-write."""
+    return load_model() is not None
 
-def predict_calories(age: int, gender: str, height: float, weight: float, activity: str, goal: str):
+
+def _decode(profiles):
+    """PROFILE_DTYPE array -> DataFrame with string categories (for a plain sklearn Pipeline)."""
+    data = {}
+    for col in FEATURE_COLS:
+        if col in CATEGORY_NAMES:
+            data[col] = np.asarray(CATEGORY_NAMES[col], dtype=object)[profiles[col]]
+        else:
+            data[col] = profiles[col]
+    return pd.DataFrame(data, columns=FEATURE_COLS)
+
+
+def predict_batch(profiles):
+    """
+    Predict daily calorie targets (kcal) for many profiles at once.
+    profiles: list of Profile or a PROFILE_DTYPE structured array.
+    Returns a list of floats, or a list of None if the model file is missing.
     """
-    Predict daily calorie target (kcal) from user inputs.
+    if not (isinstance(profiles, np.ndarray) and profiles.dtype == PROFILE_DTYPE):
+        profiles = pack_profiles(profiles)
+    model = load_model()
+    if model is None:
+        return [None] * len(profiles)
+    if isinstance(model, SharedModel):
+        preds = model.predict_encoded(profiles)
+    else:
+        preds = model.predict(_decode(profiles))
+    return [round(float(p), 2) for p in preds]
+
+
+def predict_calories(profile):
+    """
+    Predict daily calorie target (kcal) from a validated Profile.
     Returns a float or None if the model file is missing.
     """
-    if not os.path.isfile(MODEL_PATH):
-        return None
     try:
-        pipeline = joblib.load(MODEL_PATH)
-        X = pd.DataFrame(
-            [{"age": age, "gender": gender, "height": height, "weight": weight, "activity": activity, "goal": goal}],
-            columns=FEATURE_COLS,
-        )
-        pred = pipeline.predict(X)[0]
-        return round(float(pred), 2)
+        return predict_batch([profile])[0]
     except Exception:
         return None
@@ -0,0 +1,271 @@
+"""
+Shared, memory-mapped model for multi-process serving.
+Exports the numeric parts of the trained pipeline (scaler stats, one-hot
+categories, tree node arrays or linear coefficients) to plain .npy files and
+loads them back with mmap_mode="r", so every worker process maps the same
+read-only pages instead of holding its own unpickled copy of the model.
+
+Run from project root to export an existing model.pkl:
+    python ml/shared_model.py
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+ML_DIR = os.path.dirname(__file__)
+MODEL_PATH = os.path.join(ML_DIR, "model.pkl")
+SHARED_MODEL_DIR = os.path.join(ML_DIR, "model_shared")
+META_FILE = "meta.json"
+
+TREE_LEAF = -1
+
+
+def _save(out_dir, name, arr):
+    np.save(os.path.join(out_dir, f"{name}.npy"), np.ascontiguousarray(arr))
+
+
+def source_fingerprint(path=MODEL_PATH):
+    """Size and mtime of model.pkl, used to detect a stale shared export."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def file_sha256(path):
+    """SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_stale(path=SHARED_MODEL_DIR, source_path=MODEL_PATH):
+    """
+    True if model.pkl exists and is not the file the export was built from.
+    Size and mtime are checked first; when only the mtime differs (e.g. a
+    deploy that copies files without preserving it) the content hash decides.
+    """
+    current = source_fingerprint(source_path)
+    if current is None:
+        return False
+    with open(os.path.join(path, META_FILE)) as f:
+        recorded = json.load(f).get("source")
+    if not recorded or recorded["size"] != current["size"]:
+        return True
+    if recorded["mtime_ns"] == current["mtime_ns"]:
+        return False
+    return recorded.get("sha256") != file_sha256(source_path)
+
+
+def _write_arrays(pipeline, out_dir, source_path):
+    """Write the pipeline's arrays and meta.json into an empty directory."""
+    pre = pipeline.named_steps["preprocessor"]
+    model = pipeline.named_steps["model"]
+    scaler = pre.named_transformers_["num"]
+    encoder = pre.named_transformers_["cat"]
+    num_cols = list(pre.transformers_[0][2])
+    cat_cols = list(pre.transformers_[1][2])
+
+    # Keep only the one-hot columns the encoder actually emits (drop="first").
+    categories = []
+    for i, cats in enumerate(encoder.categories_):
+        drop = encoder.drop_idx_[i] if encoder.drop_idx_ is not None else None
+        categories.append([str(c) for j, c in enumerate(cats) if j != drop])
+
+    _save(out_dir, "mean", scaler.mean_)
+    _save(out_dir, "scale", scaler.scale_)
+
+    if hasattr(model, "estimators_"):
+        kind = "forest"
+        roots, lefts, rights, feats, thrs, vals = [], [], [], [], [], []
+        offset = 0
+        for est in model.estimators_:
+            tree = est.tree_
+            left = tree.children_left.astype(np.int64)
+            right = tree.children_right.astype(np.int64)
+            leaf = left == TREE_LEAF
+            # Store child indices into the concatenated node arrays.
+            lefts.append(np.where(leaf, TREE_LEAF, left + offset))
+            rights.append(np.where(leaf, TREE_LEAF, right + offset))
+            feats.append(tree.feature.astype(np.int64))
+            thrs.append(tree.threshold.astype(np.float64))
+            vals.append(tree.value[:, 0, 0].astype(np.float64))
+            roots.append(offset)
+            offset += tree.node_count
+        _save(out_dir, "roots", np.asarray(roots, dtype=np.int64))
+        _save(out_dir, "left", np.concatenate(lefts))
+        _save(out_dir, "right", np.concatenate(rights))
+        _save(out_dir, "feature", np.concatenate(feats))
+        _save(out_dir, "threshold", np.concatenate(thrs))
+        _save(out_dir, "value", np.concatenate(vals))
+    else:
+        kind = "linear"
+        _save(out_dir, "coef", np.ravel(model.coef_).astype(np.float64))
+        _save(out_dir, "intercept", np.atleast_1d(model.intercept_).astype(np.float64))
+
+    meta = {
+        "kind": kind,
+        "num_cols": num_cols,
+        "cat_cols": cat_cols,
+        "categories": categories,
+        "source": (
+            {**source_fingerprint(source_path), "sha256": file_sha256(source_path)}
+            if source_path else None
+        ),
+    }
+    with open(os.path.join(out_dir, META_FILE), "w") as f:
+        json.dump(meta, f, indent=2)
+
+
+def export_shared_model(pipeline, out_dir=SHARED_MODEL_DIR, source_path=None):
+    """
+    Write the pipeline's arrays to out_dir as .npy files plus meta.json.
+    source_path is the model.pkl the pipeline was saved to, recorded so
+    loaders can tell when the export is out of date.
+    The export is built in a temporary sibling directory and swapped in with
+    renames, so readers see either the old or the new set of arrays, never a mix.
+    """
+    final_dir = out_dir
+    parent = os.path.dirname(os.path.abspath(final_dir))
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=".model_shared-", dir=parent)
+    try:
+        _write_arrays(pipeline, tmp_dir, source_path)
+        os.chmod(tmp_dir, 0o755)  # mkdtemp creates it owner-only
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    # A directory cannot be os.replace()d over a non-empty one, so move the
+    # old export aside first. Processes that already mapped it keep their
+    # pages; a loader racing the swap fails and retries on its next call.
+    old_dir = None
+    if os.path.exists(final_dir):
+        old_dir = tempfile.mkdtemp(prefix=".model_shared-old-", dir=parent)
+        os.replace(final_dir, os.path.join(old_dir, "export"))
+    os.replace(tmp_dir, final_dir)
+    if old_dir:
+        shutil.rmtree(old_dir, ignore_errors=True)
+    return final_dir
+
+
+def has_shared_model(path=SHARED_MODEL_DIR):
+    """True if a complete shared export exists at path."""
+    return os.path.isfile(os.path.join(path, META_FILE))
+
+
+class SharedModel:
+    """Read-only model backed by memory-mapped arrays; mirrors Pipeline.predict."""
+
+    def __init__(self, meta, arrays):
+        self.kind = meta["kind"]
+        self.num_cols = meta["num_cols"]
+        self.cat_cols = meta["cat_cols"]
+        self.categories = meta["categories"]
+        self.n_features = len(self.num_cols) + sum(len(c) for c in self.categories)
+        self._code_lookup = None
+        for name, arr in arrays.items():
+            setattr(self, name, arr)
+
+    @classmethod
+    def load(cls, path=SHARED_MODEL_DIR):
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+        if meta["kind"] == "forest":
+            names = ["mean", "scale", "roots", "left", "right", "feature", "threshold", "value"]
+        else:
+            names = ["mean", "scale", "coef", "intercept"]
+        arrays = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+            for name in names
+        }
+        return cls(meta, arrays)
+
+    def transform(self, X):
+        """Scale numeric columns and one-hot encode categoricals (DataFrame in)."""
+        n = len(X)
+        out = np.zeros((n, self.n_features), dtype=np.float64)
+        k = len(self.num_cols)
+        out[:, :k] = (X[self.num_cols].to_numpy(dtype=np.float64) - self.mean) / self.scale
+        col = k
+        for name, cats in zip(self.cat_cols, self.categories):
+            values = X[name].astype(str).to_numpy()
+            for cat in cats:
+                # Unknown categories leave every column at 0 (handle_unknown="ignore").
+                out[:, col] = values == cat
+                col += 1
+        return out
+
+    def _code_columns(self):
+        """Per categorical column: enum code -> one-hot column offset (-1 = none)."""
+        if self._code_lookup is None:
+            from core.profile import CATEGORY_NAMES
+
+            self._code_lookup = [
+                np.array([cats.index(n) if n in cats else -1 for n in CATEGORY_NAMES[name]])
+                for name, cats in zip(self.cat_cols, self.categories)
+            ]
+        return self._code_lookup
+
+    def transform_encoded(self, profiles):
+        """
+        Same features as transform(), from a core.profile.PROFILE_DTYPE
+        structured array whose categoricals are already integer codes.
+        """
+        n = len(profiles)
+        out = np.zeros((n, self.n_features), dtype=np.float64)
+        k = len(self.num_cols)
+        num = np.column_stack([profiles[c].astype(np.float64) for c in self.num_cols])
+        out[:, :k] = (num - self.mean) / self.scale
+        rows = np.arange(n)
+        col = k
+        for name, lookup, cats in zip(self.cat_cols, self._code_columns(), self.categories):
+            offset = lookup[profiles[name]]
+            hit = offset >= 0
+            out[rows[hit], col + offset[hit]] = 1.0
+            col += len(cats)
+        return out
+
+    def predict(self, X):
+        return self._predict_features(self.transform(X))
+
+    def predict_encoded(self, profiles):
+        return self._predict_features(self.transform_encoded(profiles))
+
+    def _predict_features(self, Xt):
+        if self.kind == "linear":
+            return Xt @ self.coef + self.intercept[0]
+        return self._predict_forest(Xt)
+
+    def _predict_forest(self, Xt):
+        # sklearn trees compare float32 inputs against float64 thresholds.
+        Xf = Xt.astype(np.float32)
+        n = Xf.shape[0]
+        rows = np.arange(n)[:, None]
+        node = np.repeat(np.asarray(self.roots)[None, :], n, axis=0)
+        while True:
+            left = self.left[node]
+            active = left != TREE_LEAF
+            if not active.any():
+                break
+            go_left = Xf[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(active, np.where(go_left, left, self.right[node]), node)
+        return self.value[node].mean(axis=1)
+
+
+if __name__ == "__main__":
+    import joblib
+
+    if not os.path.isfile(MODEL_PATH):
+        raise FileNotFoundError(
+            f"Model not found: {MODEL_PATH}. Run: python ml/train_model.py"
+        )
+    out = export_shared_model(joblib.load(MODEL_PATH), source_path=MODEL_PATH)
+    print(f"Exported shared model -> {out}")
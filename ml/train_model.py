@@ -14,6 +14,11 @@ from sklearn.linear_model import LinearRegression
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 
+try:
+    from ml.shared_model import export_shared_model
+except ImportError:  # run as a script: python ml/train_model.py
+    from shared_model import export_shared_model
+
 ML_DIR = os.path.dirname(__file__)
 DATA_PATH = os.path.join(ML_DIR, "data", "calorie_data.csv")
 MODEL_PATH = os.path.join(ML_DIR, "model.pkl")
@@ -95,6 +100,8 @@ def main():
     os.makedirs(ML_DIR, exist_ok=True)
     joblib.dump(best, MODEL_PATH)
     print(f"\nSaved best model ({name}) -> {MODEL_PATH}")
+    shared_dir = export_shared_model(best, source_path=MODEL_PATH)
+    print(f"Exported shared (memory-mapped) model -> {shared_dir}")
 
 
 if __name__ == "__main__":
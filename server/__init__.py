@@ -0,0 +1 @@
+# Serving package (ASGI entry point, worker pools)
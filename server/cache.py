@@ -0,0 +1,48 @@
+"""
+In-process caches for rendered HTML.
+FragmentCache is a small thread-safe LRU. Keys for per-user fragments are
+tuples whose first element is the user_id, so a user's entries can be dropped
+in one call when they write new data.
+"""
+import threading
+from collections import OrderedDict
+
+
+class FragmentCache:
+    """Thread-safe LRU mapping keys to rendered HTML strings."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+            return html
+
+    def set(self, key, html):
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id):
+        """Drop every entry whose key starts with user_id."""
+        with self._lock:
+            for key in [k for k in self._entries if isinstance(k, tuple) and k[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Rendered history lists, keyed on (user_id, latest prediction id, render version).
+history_cache = FragmentCache()
+
+# Session-independent pages (landing, login, register) for anonymous visitors.
+page_cache = FragmentCache(max_entries=16)
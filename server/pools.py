@@ -0,0 +1,100 @@
+"""
+Bounded worker pools for Calorie Tracker.
+Blocking work (SQLite queries, model inference) is offloaded from async views
+to these pools. Each pool admits at most `workers + queue` jobs at a time;
+anything beyond that is rejected with PoolSaturated so the app can answer 503
+instead of letting requests pile up.
+"""
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+
+class PoolSaturated(Exception):
+    """Raised when a pool already has its maximum number of queued jobs."""
+
+    def __init__(self, pool_name):
+        super().__init__(f"{pool_name} pool is saturated")
+        self.pool_name = pool_name
+
+
+class BoundedPool:
+    """Thread or process pool with a hard cap on in-flight + queued jobs."""
+
+    def __init__(self, name, workers, queue, kind="thread"):
+        self.name = name
+        self.workers = workers
+        self.queue = queue
+        self.kind = kind
+        # Each request thread runs its async view in a separate event loop
+        # (Flask's async_to_sync), so the admission counter must be a
+        # thread-safe semaphore, not an asyncio one.
+        self._slots = threading.BoundedSemaphore(workers + queue)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Created lazily so importing the app (or forking ASGI workers)
+        # does not spawn threads/processes up front.
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.workers, thread_name_prefix=self.name
+                        )
+        return self._executor
+
+    async def run(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) in the pool; raise PoolSaturated if full."""
+        if not self._slots.acquire(blocking=False):
+            raise PoolSaturated(self.name)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), functools.partial(fn, *args, **kwargs)
+            )
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+# SQLite connections are opened per call, so a handful of threads is plenty.
+db_pool = BoundedPool(
+    "db",
+    workers=_env_int("DB_POOL_WORKERS", 8),
+    queue=_env_int("DB_POOL_QUEUE", 32),
+)
+
+# Inference is CPU-bound; MODEL_POOL_KIND=process sidesteps the GIL.
+model_pool = BoundedPool(
+    "model",
+    workers=_env_int("MODEL_POOL_WORKERS", os.cpu_count() or 2),
+    queue=_env_int("MODEL_POOL_QUEUE", 16),
+    kind=os.environ.get("MODEL_POOL_KIND", "thread"),
+)
+
+
+async def run_db(fn, *args, **kwargs):
+    """Offload a blocking database call."""
+    return await db_pool.run(fn, *args, **kwargs)
+
+
+async def run_model(fn, *args, **kwargs):
+    """Offload a model inference call."""
+    return await model_pool.run(fn, *args, **kwargs)
@@ -0,0 +1,56 @@
+"""
+Shared fixtures for the Calorie Tracker test suite.
+Run from the project root: python -m pytest tests/
+"""
+import os
+import sys
+
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database.init_db as init_db  # noqa: E402
+from database.migrate import upgrade  # noqa: E402
+from ml.train_model import build_pipeline, load_data  # noqa: E402
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """A freshly migrated SQLite database used by every db_helper call."""
+    path = str(tmp_path / "test.db")
+    monkeypatch.setattr(init_db, "DB_PATH", path)
+    upgrade(path, verbose=False)
+    return path
+
+
+# Small, fast versions of the two model kinds train_model.py can save
+MODEL_FACTORIES = {
+    "forest": lambda: RandomForestRegressor(
+        n_estimators=20, max_depth=12, min_samples_leaf=4, random_state=42
+    ),
+    "linear": LinearRegression,
+}
+
+
+@pytest.fixture(scope="session")
+def training_data():
+    """First 2000 rows of the bundled training set as (X, y)."""
+    X, y = load_data()
+    return X.iloc[:2000], y.iloc[:2000]
+
+
+@pytest.fixture(params=sorted(MODEL_FACTORIES))
+def model_kind(request):
+    """Runs the test once per model kind ("forest", "linear")."""
+    return request.param
+
+
+@pytest.fixture
+def make_pipeline(training_data):
+    """Factory: make_pipeline(kind) -> pipeline fitted on training_data."""
+    def make(kind):
+        return build_pipeline(MODEL_FACTORIES[kind]()).fit(*training_data)
+
+    return make
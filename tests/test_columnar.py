@@ -0,0 +1,87 @@
+"""
+Tests for the columnar analytics export (database/columnar.py).
+"""
+import os
+
+import pytest
+
+from database.columnar import ColumnarStore
+from database.db_helper import save_prediction, save_user_data
+from database.init_db import get_db_connection
+
+
+@pytest.fixture
+def store(db_path, tmp_path):
+    return ColumnarStore(str(tmp_path / "analytics"))
+
+
+def _predict(user_id, ml_prediction=1990.0, exercise_type="Cardio", target=2000.0):
+    return save_prediction(user_id, 1500.0, 1800.0, target, ml_prediction,
+                           150.0, 200.0, 60.0, exercise_type, 30 if exercise_type else None)
+
+
+def _set_date(table, row_id, created_at):
+    conn = get_db_connection()
+    conn.execute(f"UPDATE {table} SET created_at = ? WHERE id = ?", (created_at, row_id))
+    conn.commit()
+    conn.close()
+
+
+def test_export_is_incremental(store):
+    save_user_data(1, 30, "male", 180.0, 80.0, "light", "loss")
+    _predict(1)
+    assert store.export() == {"user_data": 1, "predictions": 1}
+    assert store.export() == {"user_data": 0, "predictions": 0}
+
+    _predict(2)
+    assert store.export()["predictions"] == 1
+    assert store.load_state() == {"user_data": 1, "predictions": 2}
+    assert sorted(store.read("predictions")["user_id"]) == [1, 2]
+
+
+def test_report_after_batch_with_all_null_columns(store):
+    # First batch has no model output and no exercise: columns are all NULL
+    _predict(1, ml_prediction=None, exercise_type=None)
+    store.export()
+    _predict(1, ml_prediction=2100.0)
+    store.export()
+
+    df = store.read("predictions")
+    assert df["ml_prediction"].isna().sum() == 1
+    report = store.prediction_report()
+    assert report["predictions"].sum() == 2
+    assert report["ml_mae"].iloc[0] == 100.0
+
+
+def test_report_date_range_uses_partitions(store):
+    for day in ("2026-01-01", "2026-01-02", "2026-01-03"):
+        _set_date("predictions", _predict(1), f"{day} 08:00:00")
+    _set_date("predictions", _predict(1), None)
+    store.export()
+
+    report = store.prediction_report(start="2026-01-02")
+    assert list(report.index) == ["2026-01-02", "2026-01-03"]
+    assert len(store.read("predictions")) == 4
+    assert len(store.read("predictions", start="2026-01-01", end="2026-01-01")) == 1
+
+
+def _files(store, table, date):
+    return sorted(os.listdir(os.path.join(store.root, table, f"date={date}")))
+
+
+def test_compact_merges_closed_days_only(store):
+    for _ in range(3):
+        _set_date("predictions", _predict(1), "2026-01-01 08:00:00")
+        _set_date("predictions", _predict(1), "2026-01-02 08:00:00")
+        store.export()
+    assert len(_files(store, "predictions", "2026-01-01")) == 3
+
+    assert store.compact(today="2026-01-02") == {"user_data": 0, "predictions": 1}
+    assert _files(store, "predictions", "2026-01-01") == [
+        "part-000000000001-000000000005.parquet"
+    ]
+    assert len(_files(store, "predictions", "2026-01-02")) == 3  # still open
+
+    df = store.read("predictions")
+    assert sorted(df["id"]) == [1, 2, 3, 4, 5, 6]
+    assert store.compact(today="2026-01-02")["predictions"] == 0
@@ -0,0 +1,97 @@
+"""
+Tests for history fragment caching and conditional GET handling in app.py.
+"""
+import pytest
+
+import app as app_module
+from app import app
+from database.db_helper import create_user, save_prediction
+from server.cache import history_cache, page_cache
+
+
+@pytest.fixture
+def client(db_path, monkeypatch):
+    history_cache.clear()
+    page_cache.clear()
+    monkeypatch.setattr(app_module, "_render_version", None)
+    return app.test_client()
+
+
+def _new_release(monkeypatch):
+    monkeypatch.setattr(app_module, "APP_VERSION", "next-release")
+    monkeypatch.setattr(app_module, "_render_version", None)
+
+
+@pytest.fixture
+def user_client(client):
+    user_id = create_user("alice", "alice@example.com", "hash")
+    with client.session_transaction() as sess:
+        sess["user"] = "alice"
+        sess["user_id"] = user_id
+    client.user_id = user_id
+    return client
+
+
+def _save(user_id, target=2000.0):
+    return save_prediction(user_id, 1500.0, 1800.0, target, 1990.0, 150.0, 200.0, 60.0)
+
+
+def test_history_revalidates_with_304(user_client):
+    _save(user_client.user_id)
+    first = user_client.get("/history")
+    assert first.status_code == 200
+    assert "2000.0" in first.get_data(as_text=True)
+
+    again = user_client.get("/history", headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+    assert again.get_data() == b""
+
+
+def test_new_prediction_changes_history_etag(user_client):
+    _save(user_client.user_id)
+    etag = user_client.get("/history").headers["ETag"]
+
+    _save(user_client.user_id, target=2345.0)
+    response = user_client.get("/history", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert "2345.0" in response.get_data(as_text=True)
+
+
+def test_deploy_version_changes_history_etag(user_client, monkeypatch):
+    _save(user_client.user_id)
+    etag = user_client.get("/history").headers["ETag"]
+
+    _new_release(monkeypatch)
+    response = user_client.get("/history", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_static_page_cached_per_version(client, monkeypatch):
+    first = client.get("/login")
+    assert first.status_code == 200
+    assert client.get("/login", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    _new_release(monkeypatch)
+    client.get("/login")
+    versions = {key[1] for key in page_cache._entries}
+    assert len(versions) == 2
+
+
+def test_stylesheet_is_versioned_and_long_cached(client):
+    html = client.get("/login").get_data(as_text=True)
+    assert "/static/style.css?v=" in html
+    response = client.get("/static/style.css")
+    assert response.status_code == 200
+    assert "max-age=31536000" in response.headers["Cache-Control"]
+
+
+def test_repeat_history_does_not_rescan_templates(user_client, monkeypatch):
+    _save(user_client.user_id)
+    etag = user_client.get("/history").headers["ETag"]
+
+    def fail(*args):
+        raise AssertionError("templates rescanned")
+
+    monkeypatch.setattr(app_module.os, "listdir", fail)
+    assert user_client.get("/history", headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,82 @@
+"""
+Tests for the schema migration runner (database/migrate.py).
+"""
+import sqlite3
+
+from database.migrate import (
+    _connect, backfill_in_batches, current_version, discover_migrations, status, upgrade
+)
+
+
+def _tables(path):
+    conn = sqlite3.connect(path)
+    names = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type IN ('table', 'index')"
+    )}
+    conn.close()
+    return names
+
+
+def test_migrations_are_numbered_in_order():
+    versions = [version for version, _, _ in discover_migrations()]
+    assert versions == sorted(versions)
+    assert versions[:3] == [1, 2, 3]
+
+
+def test_upgrade_applies_in_order_and_is_idempotent(tmp_path):
+    path = str(tmp_path / "fresh.db")
+    applied = upgrade(path, verbose=False)
+    assert applied == [v for v, _, _ in discover_migrations()]
+    assert {"users", "user_data", "predictions", "idx_predictions_user_id",
+            "monitor_state", "schema_version"} <= _tables(path)
+
+    assert upgrade(path, verbose=False) == []
+    conn = _connect(path)
+    assert current_version(conn) == applied[-1]
+    assert conn.execute("SELECT COUNT(*) FROM schema_version").fetchone()[0] == len(applied)
+    conn.close()
+
+
+def test_upgrade_stops_at_target_then_resumes(tmp_path):
+    path = str(tmp_path / "stepwise.db")
+    assert upgrade(path, target=1, verbose=False) == [1]
+    assert "idx_predictions_user_id" not in _tables(path)
+    assert [done for _, _, done in status(path)][:2] == [True, False]
+
+    assert upgrade(path, verbose=False)[0] == 2
+
+
+def test_upgrade_adopts_database_created_before_migrations(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                 "username TEXT UNIQUE NOT NULL, email TEXT UNIQUE NOT NULL, "
+                 "password_hash TEXT NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+    conn.execute("INSERT INTO users (username, email, password_hash) VALUES ('a', 'a@b.co', 'x')")
+    conn.commit()
+    conn.close()
+
+    upgrade(path, verbose=False)
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT username FROM users").fetchall() == [("a",)]
+    conn.close()
+
+
+def test_backfill_binds_set_and_where_params_separately(db_path):
+    conn = _connect(db_path)
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT INTO predictions (user_id, bmr) VALUES (?, ?)",
+        [(1 if i % 2 else 2, float(i)) for i in range(25)],
+    )
+    conn.execute("COMMIT")
+
+    updated = backfill_in_batches(
+        conn, "predictions", "tdee = bmr * ?", "user_id = ?",
+        set_params=(1.5,), where_params=(1,), batch_size=4,
+    )
+    assert updated == 12
+    rows = conn.execute("SELECT user_id, bmr, tdee FROM predictions").fetchall()
+    for user_id, bmr, tdee in rows:
+        assert tdee == (bmr * 1.5 if user_id == 1 else None)
+    conn.close()
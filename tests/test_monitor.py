@@ -0,0 +1,98 @@
+"""
+Tests for the streaming drift monitor (ml/monitor.py).
+"""
+import time
+
+import pytest
+
+from database.db_helper import save_prediction, save_user_data
+from database.repository import get_repository
+from ml import monitor
+from ml.monitor import DriftMonitor, RunningStats, STATE_NAME
+
+
+@pytest.fixture
+def training_csv(tmp_path, monkeypatch):
+    path = tmp_path / "calorie_data.csv"
+    path.write_text(
+        "age,gender,height,weight,activity,goal,calorie_target\n"
+        "30,male,180,80,light,loss,2000\n"
+        "40,female,165,60,moderate,gain,2200\n"
+    )
+    monkeypatch.setattr(monitor, "DATA_PATH", str(path))
+    monkeypatch.setattr(monitor, "MODEL_PATH", str(tmp_path / "model.pkl"))
+    return path
+
+
+def _row(user_id=1, ml_prediction=2100.0, age=30, activity="light"):
+    save_user_data(user_id, age, "male", 180.0, 80.0, activity, "loss")
+    save_prediction(user_id, 1500.0, 1800.0, 2000.0, ml_prediction, 150.0, 200.0, 60.0)
+
+
+def test_running_stats_match_batch_values():
+    stats = RunningStats()
+    for x in [2.0, 4.0, 4.0, 4.0, 5.0, 5.0, 7.0, 9.0]:
+        stats.update(x)
+    assert stats.mean == pytest.approx(5.0)
+    assert stats.std == pytest.approx(2.138, abs=1e-3)
+    assert (stats.minimum, stats.maximum) == (2.0, 9.0)
+
+
+def test_run_resumes_from_watermark(db_path, training_csv):
+    for _ in range(3):
+        _row()
+    report = monitor.run_once()
+    assert report["watermarks"] == {"predictions": 3, "user_data": 3}
+    assert report["error"]["count"] == 3
+
+    # Nothing new: state is unchanged
+    assert monitor.run_once()["error"]["count"] == 3
+
+    _row(ml_prediction=None)
+    _row(ml_prediction=1900.0)
+    report = monitor.run_once()
+    assert report["watermarks"] == {"predictions": 5, "user_data": 5}
+    assert report["error"]["count"] == 4  # NULL prediction advances the watermark only
+    assert sum(report["inputs"]["age"]["counts"]) == 5
+    assert monitor.get_metrics() == report
+
+
+def test_activity_bins_follow_profile_categories(db_path, training_csv):
+    _row(activity="moderate")
+    _row(activity="bogus")
+    report = monitor.run_once()
+    activity = report["inputs"]["activity"]
+    assert activity["bins"] == ["sedentary", "light", "moderate", "active", "other"]
+    assert activity["counts"] == [0, 0, 1, 0, 1]
+
+
+def test_reference_rebuilt_when_training_data_changes(db_path, training_csv):
+    monitor.run_once()
+    before = get_repository().load_monitor_state(STATE_NAME)["reference"]
+    assert sum(before["age"]) == 2
+
+    time.sleep(0.01)
+    with open(training_csv, "a") as f:
+        f.write("70,male,170,90,active,maintain,2500\n")
+    monitor.run_once()
+    after = get_repository().load_monitor_state(STATE_NAME)["reference"]
+    assert sum(after["age"]) == 3
+
+
+def test_error_stats_reset_when_model_changes(db_path, training_csv, tmp_path):
+    _row()
+    assert monitor.run_once()["error"]["count"] == 1
+
+    (tmp_path / "model.pkl").write_bytes(b"retrained")
+    _row()
+    assert monitor.run_once()["error"]["count"] == 1
+
+
+def test_drift_flagged_when_inputs_shift(training_csv):
+    state_monitor = DriftMonitor()
+    monitor.refresh_reference(state_monitor)
+    for _ in range(monitor.MIN_SAMPLES):
+        state_monitor.histograms["age"].update(85)
+    report = state_monitor.report()
+    assert report["drift"]["age"] is True
+    assert report["retrain_recommended"] is True
@@ -0,0 +1,72 @@
+"""
+Tests for Profile validation/encoding and batch prediction equivalence.
+"""
+import numpy as np
+import pytest
+
+import ml.predict
+from core.profile import (
+    PROFILE_DTYPE, Activity, Gender, Goal, Profile, ProfileError, pack_profiles
+)
+from ml.predict import predict_batch, predict_calories
+from ml.shared_model import SharedModel, export_shared_model
+
+FORM = {
+    "age": "30", "gender": "male", "height": "180.5", "weight": "80.2",
+    "activity": "moderate", "goal": "loss",
+}
+
+
+def test_from_form_parses_and_encodes():
+    profile = Profile.from_form(FORM)
+    assert (profile.age, profile.height, profile.weight) == (30, 180.5, 80.2)
+    assert profile.gender is Gender.MALE
+    assert profile.activity is Activity.MODERATE
+    assert profile.goal is Goal.LOSS
+    assert (profile.gender_name, profile.activity_name, profile.goal_name) == (
+        "male", "moderate", "loss"
+    )
+    with pytest.raises(AttributeError):
+        profile.extra = 1  # __slots__
+
+
+@pytest.mark.parametrize("field, value", [
+    ("gender", "other"),
+    ("activity", "extreme"),
+    ("goal", None),
+    ("age", "abc"),
+    ("age", "12"),
+    ("height", "400"),
+    ("weight", ""),
+])
+def test_invalid_input_is_rejected(field, value):
+    with pytest.raises(ProfileError):
+        Profile.from_form({**FORM, field: value})
+
+
+def test_pack_profiles_keeps_inputs_exact():
+    profiles = [Profile.from_form(FORM), Profile(45, "female", 162.3, 61.7, "active", "gain")]
+    packed = pack_profiles(profiles)
+    assert packed.dtype == PROFILE_DTYPE
+    assert packed["height"].tolist() == [180.5, 162.3]
+    assert packed["weight"].tolist() == [80.2, 61.7]
+    assert packed["activity"].tolist() == [Activity.MODERATE, Activity.ACTIVE]
+
+
+@pytest.fixture(scope="module")
+def profiles(training_data):
+    X, _ = training_data
+    return [Profile(*row) for row in X.itertuples(index=False)]
+
+
+@pytest.mark.parametrize("shared", [True, False], ids=["shared", "pipeline"])
+def test_predict_batch_matches_pipeline(model_kind, shared, make_pipeline, training_data,
+                                        profiles, tmp_path, monkeypatch):
+    X, _ = training_data
+    pipeline = make_pipeline(model_kind)
+    model = SharedModel.load(export_shared_model(pipeline, str(tmp_path / "shared"))) if shared else pipeline
+    monkeypatch.setattr(ml.predict, "_model", model)
+
+    expected = np.round(pipeline.predict(X), 2)
+    np.testing.assert_allclose(predict_batch(profiles), expected, rtol=0, atol=1e-9)
+    assert predict_calories(profiles[0]) == expected[0]
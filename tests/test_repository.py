@@ -0,0 +1,36 @@
+"""
+Tests for the storage repository interface (database/repository.py).
+"""
+import pytest
+
+from database import db_helper
+from database.repository import Repository, SQLiteRepository, get_repository, set_repository
+
+
+def test_partial_backend_cannot_be_instantiated():
+    class Partial(Repository):
+        def get_user_by_username(self, username):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_db_helper_delegates_to_active_repository(db_path):
+    class Recording(SQLiteRepository):
+        def __init__(self):
+            self.calls = []
+
+        def get_user_by_email(self, email):
+            self.calls.append(email)
+            return super().get_user_by_email(email)
+
+    original = get_repository()
+    recording = Recording()
+    set_repository(recording)
+    try:
+        user_id = db_helper.create_user("carol", "carol@example.com", "hash")
+        assert db_helper.get_user_by_email("carol@example.com")["id"] == user_id
+    finally:
+        set_repository(original)
+    assert recording.calls == ["carol@example.com"]
@@ -0,0 +1,129 @@
+"""
+Tests for the ASGI serving mode and bounded worker pools.
+"""
+import asyncio
+import time
+
+from flask import Flask
+
+from asgi import make_asgi_app
+from server.pools import BoundedPool, PoolSaturated, db_pool, run_db
+
+SLEEP = 0.5
+
+
+async def _get(asgi_app, path):
+    """Send one GET through the ASGI interface; return the status code."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 50000),
+    }
+    messages = []
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()  # never disconnect
+
+    async def send(message):
+        messages.append(message)
+
+    await asgi_app(scope, receive, send)
+    return next(m["status"] for m in messages if m["type"] == "http.response.start")
+
+
+def test_slow_requests_run_concurrently():
+    flask_app = Flask(__name__)
+
+    @flask_app.route("/slow")
+    async def slow():
+        await run_db(time.sleep, SLEEP)
+        return "ok"
+
+    asgi_app = make_asgi_app(flask_app, threads=8)
+
+    async def burst(n):
+        return await asyncio.gather(*[_get(asgi_app, "/slow") for _ in range(n)])
+
+    start = time.monotonic()
+    statuses = asyncio.run(burst(4))
+    elapsed = time.monotonic() - start
+
+    assert statuses == [200] * 4
+    # Four requests overlapping should take about as long as one
+    assert elapsed < SLEEP * 2
+
+
+def test_pool_rejects_when_full():
+    pool = BoundedPool("test", workers=1, queue=1)
+
+    async def flood():
+        return await asyncio.gather(
+            *[pool.run(time.sleep, 0.2) for _ in range(3)], return_exceptions=True
+        )
+
+    results = asyncio.run(flood())
+    pool.shutdown()
+    assert sum(isinstance(r, PoolSaturated) for r in results) == 1
+    assert results.count(None) == 2
+
+
+def test_saturated_db_pool_returns_503(db_path):
+    from app import app
+
+    slots = db_pool.workers + db_pool.queue
+    for _ in range(slots):
+        assert db_pool._slots.acquire(blocking=False)
+    try:
+        response = app.test_client().post(
+            "/login", data={"username": "someone", "password": "secret"}
+        )
+    finally:
+        for _ in range(slots):
+            db_pool._slots.release()
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_dashboard_save_rejected_with_503_when_db_pool_full(db_path):
+    from app import app
+    from database.db_helper import create_user, get_user_data_history, get_user_predictions
+
+    user_id = create_user("bob", "bob@example.com", "hash")
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess["user"] = "bob"
+        sess["user_id"] = user_id
+    form = {"age": "30", "gender": "male", "height": "180", "weight": "80",
+            "activity": "light", "goal": "loss"}
+
+    slots = db_pool.workers + db_pool.queue
+    for _ in range(slots):
+        assert db_pool._slots.acquire(blocking=False)
+    try:
+        response = client.post("/dashboard", data=form)
+    finally:
+        for _ in range(slots):
+            db_pool._slots.release()
+
+    assert response.status_code == 503
+    assert get_user_data_history(user_id) == []
+    assert get_user_predictions(user_id) == []
+
+    assert client.post("/dashboard", data=form).status_code == 200
+    assert len(get_user_data_history(user_id)) == 1
+    assert len(get_user_predictions(user_id)) == 1
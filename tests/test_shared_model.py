@@ -0,0 +1,93 @@
+"""
+Tests for the memory-mapped shared model export (ml/shared_model.py).
+"""
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from ml.shared_model import SharedModel, export_shared_model, is_stale
+from ml.train_model import FEATURE_COLS, build_pipeline
+
+
+def test_shared_model_matches_pipeline(model_kind, make_pipeline, training_data, tmp_path):
+    X, _ = training_data
+    pipeline = make_pipeline(model_kind)
+    shared = SharedModel.load(export_shared_model(pipeline, str(tmp_path / "shared")))
+
+    assert shared.kind == model_kind
+    np.testing.assert_allclose(shared.predict(X), pipeline.predict(X), rtol=0, atol=1e-8)
+
+
+@pytest.mark.filterwarnings("ignore:Found unknown categories")
+def test_unknown_category_is_ignored_like_sklearn(make_pipeline, tmp_path):
+    pipeline = make_pipeline("forest")
+    shared = SharedModel.load(export_shared_model(pipeline, str(tmp_path / "shared")))
+    odd = pd.DataFrame(
+        [{"age": 30, "gender": "other", "height": 170.0, "weight": 70.0,
+          "activity": "extreme", "goal": "loss"}],
+        columns=FEATURE_COLS,
+    )
+    np.testing.assert_allclose(shared.predict(odd), pipeline.predict(odd), atol=1e-8)
+
+
+def test_reexport_replaces_previous_arrays(make_pipeline, training_data, tmp_path):
+    X, _ = training_data
+    out = str(tmp_path / "shared")
+    export_shared_model(make_pipeline("forest"), out)
+    linear = make_pipeline("linear")
+    export_shared_model(linear, out)
+
+    assert sorted(os.listdir(tmp_path)) == ["shared"]
+    assert not os.path.exists(os.path.join(out, "left.npy"))
+    np.testing.assert_allclose(SharedModel.load(out).predict(X), linear.predict(X), atol=1e-8)
+
+
+def test_copy_without_mtime_is_not_stale(training_data, tmp_path):
+    X, y = training_data
+    pkl = str(tmp_path / "model.pkl")
+    out = str(tmp_path / "shared")
+    pipeline = build_pipeline(LinearRegression()).fit(X, y)
+    joblib.dump(pipeline, pkl)
+    export_shared_model(pipeline, out, source_path=pkl)
+
+    # Same bytes, new mtime (e.g. copied by a deploy)
+    os.utime(pkl, ns=(0, 10**18))
+    assert not is_stale(out, pkl)
+
+
+def test_stale_export_falls_back_with_warning(training_data, tmp_path, monkeypatch, caplog):
+    import ml.predict
+
+    X, y = training_data
+    pkl = str(tmp_path / "model.pkl")
+    out = str(tmp_path / "shared")
+    pipeline = build_pipeline(LinearRegression()).fit(X, y)
+    export_shared_model(pipeline, out, source_path=None)
+    joblib.dump(pipeline, pkl)
+    monkeypatch.setattr(ml.predict, "_model", None)
+    monkeypatch.setattr(ml.predict, "SHARED_MODEL_DIR", out)
+    monkeypatch.setattr(ml.predict, "MODEL_PATH", pkl)
+
+    with caplog.at_level("WARNING", logger="ml.predict"):
+        model = ml.predict.load_model()
+    assert not isinstance(model, SharedModel)
+    assert "older than" in caplog.text
+
+
+def test_export_goes_stale_when_model_pkl_is_replaced(training_data, tmp_path):
+    X, y = training_data
+    pkl = str(tmp_path / "model.pkl")
+    out = str(tmp_path / "shared")
+    pipeline = build_pipeline(LinearRegression()).fit(X, y)
+    joblib.dump(pipeline, pkl)
+    export_shared_model(pipeline, out, source_path=pkl)
+    assert not is_stale(out, pkl)
+
+    time.sleep(0.01)
+    joblib.dump(build_pipeline(LinearRegression()).fit(X.iloc[:500], y.iloc[:500]), pkl)
+    assert is_stale(out, pkl)